@@ -2,24 +2,157 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 # Standard library imports.
+import atexit
 import logging
 import os
+import queue
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 
 # Local application imports.
 import constants
 
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A file handler that opens the log file with a large write buffer.
+    """
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=constants.LOG_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    A queue handler that starts the background logging threads when the first record is queued,
+    so that importing this module does not start any thread.
+    """
+
+    def enqueue(self, record):
+        start_log_threads()
+        super().enqueue(record)
+
+
+def flush_log_file():
+    """
+    Flushes the buffered log records to the log file at a fixed interval.
+    """
+    while not Flush_Stop.wait(constants.LOG_FLUSH_INTERVAL):
+        Memory_Handler.flush()
+        File_Handler.flush()
+
+
+def start_log_threads():
+    """
+    Starts the queue listener writing the log file and the periodic flush thread, once.
+    """
+    with Threads_Lock:
+        if Threads_Started.is_set():
+            return
+        Queue_Listener.start()
+        threading.Thread(target=flush_log_file, daemon=True).start()
+        Threads_Started.set()
+
+
+def stop_log_threads():
+    """
+    Stops the background logging threads and writes the buffered records to the log file.
+    """
+    with Threads_Lock:
+        if Threads_Started.is_set():
+            Flush_Stop.set()
+            Queue_Listener.stop()
+    Memory_Handler.close()
+    File_Handler.close()
+
+
+def create_process_log_queue(mp_context):
+    """
+    Creates a queue through which worker processes send their log records to the handlers of this process.
+
+    Args:
+        mp_context (multiprocessing.context.BaseContext): The multiprocessing context of the worker processes.
+
+    Returns:
+        tuple: A tuple containing:
+            - log_queue (multiprocessing.Queue): The queue to pass to set_log_queue in the worker processes.
+            - listener (QueueListener): The started listener, to be stopped once the workers are done.
+    """
+    start_log_threads()
+    log_queue = mp_context.Queue(-1)
+    listener = QueueListener(
+        log_queue, Memory_Handler, Stream_Handler, respect_handler_level=True
+    )
+    listener.start()
+    return log_queue, listener
+
+
+def set_log_queue(log_queue):
+    """
+    Sends the log records of the current process to the given queue.
+
+    Args:
+        log_queue (multiprocessing.Queue): The queue created by create_process_log_queue.
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
-if not os.path.exists(constants.LOG_PATH):
-    os.makedirs(constants.LOG_PATH)
-formatter = logging.Formatter(
-    "%(asctime)s %(levelname)s %(message)s", datefmt="%Y-%m-%dT%I:%M:%S"
-)
-File_Handler = logging.FileHandler(
-    "{}{}".format(constants.LOG_PATH, constants.LOG_FILE_NAME)
-)
-File_Handler.setFormatter(formatter)
-logger.addHandler(File_Handler)
-Stream_Handler = logging.StreamHandler()
-Stream_Handler.setFormatter(formatter)
-logger.addHandler(Stream_Handler)
+logger.propagate = False
+# The logger outlives this module, so reuse its handlers if this module is imported again.
+if not hasattr(logger, "log_handlers"):
+    os.makedirs(constants.LOG_PATH, exist_ok=True)
+    formatter = logging.Formatter(
+        "%(asctime)s %(levelname)s %(message)s", datefmt="%Y-%m-%dT%I:%M:%S"
+    )
+    File_Handler = BufferedFileHandler(
+        "{}{}".format(constants.LOG_PATH, constants.LOG_FILE_NAME), delay=True
+    )
+    File_Handler.setFormatter(formatter)
+    # Buffer records for the log file, flushing immediately on warnings and errors.
+    Memory_Handler = MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.WARNING,
+        target=File_Handler,
+        flushOnClose=True,
+    )
+    # Console output stays synchronous, so that it is not interleaved with password prompts.
+    Stream_Handler = logging.StreamHandler()
+    Stream_Handler.setFormatter(formatter)
+    logger.addHandler(Stream_Handler)
+    # Log records are queued and written to the file by a background thread.
+    Log_Queue = queue.Queue(-1)
+    logger.addHandler(LazyQueueHandler(Log_Queue))
+    Queue_Listener = QueueListener(Log_Queue, Memory_Handler)
+    Flush_Stop = threading.Event()
+    Threads_Started = threading.Event()
+    Threads_Lock = threading.Lock()
+    # Drain the queue and write the buffered records before the interpreter exits.
+    atexit.register(stop_log_threads)
+    logger.log_handlers = (
+        File_Handler,
+        Memory_Handler,
+        Stream_Handler,
+        Queue_Listener,
+        Flush_Stop,
+        Threads_Started,
+        Threads_Lock,
+    )
+(
+    File_Handler,
+    Memory_Handler,
+    Stream_Handler,
+    Queue_Listener,
+    Flush_Stop,
+    Threads_Started,
+    Threads_Lock,
+) = logger.log_handlers
@@ -4,3 +4,8 @@
 LOG_PATH = "./logs/"
 LOG_FILE_NAME = "imaging.log"
 ESXI_CDROM_MOUNT_DIR = "./esxi_cdrom_mount"
+CHKSUM_BUFFER_SIZE = 4 * 1024 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+LOG_FLUSH_INTERVAL = 30
+LOG_BUFFER_SIZE = 1024 * 1024
+CHKSUM_CACHE_SUFFIX = ".chksumcache"
@@ -19,48 +19,125 @@ Example:
 # Standard library imports.
 import argparse
 import hashlib
+import io
 import ipaddress
 import json
+import multiprocessing
 import os
-import random
 import re
 import shutil
-import string
+import stat
 import subprocess
 import sys
+import tempfile
 import time
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Third-party imports.
 import maskpass
-import psutil
+
+try:
+    # Optional, parses large JSON files faster than the json module.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional, hashes the root password when the crypt module is not available.
+    from passlib.hash import sha512_crypt
+except ImportError:
+    sha512_crypt = None
+
+try:
+    # Deprecated since Python 3.11 and removed in Python 3.13.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        import crypt
+except ImportError:
+    crypt = None
 
 # Local application imports.
 import constants
-from LogUtility import logger
-
-
-def run_subprocess_cmd(cmd, description):
+from LogUtility import create_process_log_queue, logger, set_log_queue
+
+# Kernel options of the installer boot.cfg that are replaced to load the kickstart file.
+# "kernelopt=runweasel" also covers "kernelopt=runweasel cdromBoot", keeping "cdromBoot".
+BOOT_KERNELOPT_PATTERN = re.compile(
+    r"kernelopt=(?:cdromBoot runweasel|runweasel)", re.IGNORECASE
+)
+BOOT_KERNELOPT_REPLACEMENT = "kernelopt=runweasel ks=cdrom:/KS.CFG"
+# Installer boot.cfg files that are updated to load the kickstart file.
+BOOT_CONFIG_FILES = ("boot.cfg", "efi/boot/boot.cfg")
+# Checksum algorithms accepted in 'isoChecksum', excluding the variable-length SHAKE digests.
+CHKSUM_ALGORITHMS = hashlib.algorithms_guaranteed - {"shake_128", "shake_256"}
+# Regular expression pattern for MAC addresses.
+MAC_PATTERN = re.compile(r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$", re.ASCII)
+
+
+def run_subprocess_cmd(cmd, description, input_data=None):
     """
-    Executes a system command and returns the output.
+    Executes a system command without a shell and returns the output.
 
     Args:
-        cmd (str): The system command to execute.
+        cmd (list): The system command to execute as a list of arguments.
         description (str): A description of the command being executed.
+        input_data (str, optional): The data to send to the standard input of the command.
+            Defaults to None.
 
     Returns:
         str: The output from the command execution.
     """
     try:
-        output = subprocess.run([cmd], shell=True, capture_output=True, text=True)
-        if output.returncode != 0:
-            logger.error(output.stderr)
+        output = subprocess.run(cmd, capture_output=True, text=True, input=input_data)
+    except FileNotFoundError:
+        logger.error(f"{cmd[0]}: command not found")
+        logger.error(f"{description} command did not run successfully. Exiting...")
+        sys.exit()
+    if output.returncode != 0:
+        logger.error(output.stderr)
+        logger.error(f"{description} command did not run successfully. Exiting...")
+        sys.exit()
+    logger.info(f"{description} cmd ran successfully.")
+    return output.stdout
+
+
+def run_subprocess_cmd_to_file(cmd, file_path, description):
+    """
+    Executes a system command that writes a file to its standard output, and saves the file
+    while calculating its MD5 checksum, so that the file does not have to be read again.
+
+    Args:
+        cmd (list): The system command to execute as a list of arguments.
+        file_path (str): The path of the file to save the output to.
+        description (str): A description of the command being executed.
+
+    Returns:
+        str: The hexadecimal MD5 checksum of the file.
+    """
+    md5 = hashlib.md5()
+    # Collect the error output in a file so that a full pipe cannot block the command.
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        except FileNotFoundError:
+            logger.error(f"{cmd[0]}: command not found")
             logger.error(f"{description} command did not run successfully. Exiting...")
             sys.exit()
-        else:
-            logger.info(f"{description} cmd ran successfully.")
-            return output.stdout
-    except subprocess.CalledProcessError as e:
-        logger.error("Error occurred:", e)
+        with process, open(file_path, "wb") as file:
+            for chunk in iter(
+                lambda: process.stdout.read(constants.CHKSUM_BUFFER_SIZE), b""
+            ):
+                file.write(chunk)
+                md5.update(chunk)
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            logger.error(stderr_file.read().decode(errors="replace"))
+            logger.error(f"{description} command did not run successfully. Exiting...")
+            sys.exit()
+    logger.info(f"{description} cmd ran successfully.")
+    return md5.hexdigest()
 
 
 def generate_encrypted_root_pwd():
@@ -95,28 +172,207 @@ def generate_encrypted_root_pwd():
     logger.info(
         "Generating an encrypted password for the ESXi root account using a SHA512-based password algorithm."
     )
+    # Hash the password in-process when possible, instead of running openssl.
+    if crypt and crypt.METHOD_SHA512 in crypt.methods:
+        return crypt.crypt(esxi_root_pwd1, crypt.mksalt(crypt.METHOD_SHA512))
+    if sha512_crypt:
+        # Use the default 5000 rounds of crypt and openssl, instead of the passlib default.
+        return sha512_crypt.using(rounds=5000).hash(esxi_root_pwd1)
+    # Pass the password through the standard input, so that it is not visible in the process list.
     cmd_output = run_subprocess_cmd(
-        f"openssl passwd -6 {esxi_root_pwd1}", "Generate an encrypted password"
+        ["openssl", "passwd", "-6", "-stdin"],
+        "Generate an encrypted password",
+        input_data=esxi_root_pwd1,
     )
-    return cmd_output
+    return cmd_output.strip()
 
 
-def case_insensitive_search_and_replace(file_path, search_word, replace_word):
+def update_boot_config(file_path):
     """
-    Finds and replaces a word in a file, ignoring case.
+    Adds the kickstart file location to the kernel options of a boot.cfg file in a single pass.
 
     Args:
-        file_path (str): The path to the file.
-        search_word (str): The word to search for.
-        replace_word (str): The word to replace the search word with.
+        file_path (str): The path to the boot.cfg file.
     """
-    with open(file_path, "r") as file:
-        file_contents = file.read()
-        pattern = re.compile(re.escape(search_word), re.IGNORECASE)
-        updated_contents = pattern.sub(replace_word, file_contents)
-
-    with open(file_path, "w") as file:
+    # Files extracted from an ISO are read-only.
+    os.chmod(file_path, os.stat(file_path).st_mode | stat.S_IWUSR)
+    # Read and rewrite the file through a single open file.
+    with open(file_path, "r+") as file:
+        updated_contents = BOOT_KERNELOPT_PATTERN.sub(
+            BOOT_KERNELOPT_REPLACEMENT, file.read()
+        )
+        file.seek(0)
         file.write(updated_contents)
+        file.truncate()
+
+
+def extract_iso(iso_file, target_folder):
+    """
+    Extracts the contents of an ISO image into a folder.
+
+    The ISO is read once with 7z when available, which does not require a loop mount.
+    Otherwise the ISO is mounted and its contents are copied.
+    Use extract_iso_with_chksum when bsdtar is available.
+
+    Args:
+        iso_file (str): The path to the ISO file.
+        target_folder (str): The folder to extract the contents into.
+    """
+    if shutil.which("7z"):
+        # Skip the El Torito boot images, which 7z lists under a virtual [BOOT] folder.
+        run_subprocess_cmd(
+            ["7z", "x", "-y", "-x![BOOT]", f"-o{target_folder}", iso_file],
+            "Extracting ISO",
+        )
+        return
+
+    # Use a mount folder per target folder, since several images may be built in parallel.
+    mnt_folder = f"{constants.ESXI_CDROM_MOUNT_DIR}_{os.path.basename(target_folder)}"
+    os.makedirs(mnt_folder, exist_ok=True)
+    # Mount the ISO file, copy the contents into the target folder, and umount.
+    run_subprocess_cmd(["mount", "-o", "loop", iso_file, mnt_folder], "Mounting ISO")
+    try:
+        # Copy in-process; shutil copies the file data in the kernel where possible.
+        # Reflink cloning is not attempted: the source is a read-only iso9660 mount on a
+        # different filesystem, so its data blocks can never be shared with the target.
+        shutil.copytree(
+            mnt_folder, target_folder, copy_function=shutil.copy2, dirs_exist_ok=True
+        )
+    except OSError as error:
+        logger.error(error)
+        logger.error("Copying the ISO did not run successfully. Exiting...")
+        sys.exit()
+    finally:
+        run_subprocess_cmd(["umount", mnt_folder], "Unmounting ISO")
+        os.rmdir(mnt_folder)
+    logger.info("Copying the ISO ran successfully.")
+
+
+def extract_iso_with_chksum(iso_file, target_folder, algorithm="md5", iso_paths=None):
+    """
+    Extracts an ISO image into a folder using bsdtar while calculating its checksum,
+    so that the ISO is read only once.
+
+    Args:
+        iso_file (str): The path to the ISO file.
+        target_folder (str): The folder to extract the contents into.
+        algorithm (str, optional): The hashlib algorithm of the checksum. Defaults to "md5".
+            If None, no checksum is calculated and bsdtar reads the ISO file directly.
+        iso_paths (iterable, optional): The paths of the files to extract relative to the root
+            of the ISO, ignoring case. Defaults to None, which extracts all files.
+
+    Returns:
+        str: The hexadecimal checksum of the ISO file, or None if no algorithm is given.
+    """
+    patterns = [
+        "".join(
+            f"[{char.lower()}{char.upper()}]" if char.isalpha() else char
+            for char in iso_path
+        )
+        for iso_path in iso_paths or ()
+    ]
+    if algorithm is None:
+        # bsdtar only reads the parts of the ISO it needs.
+        run_subprocess_cmd(
+            ["bsdtar", "-xf", iso_file, "-C", target_folder, *patterns],
+            "Extracting ISO",
+        )
+        return None
+    args = ["bsdtar", "-xf", "-", "-C", target_folder, *patterns]
+    file_hash = hashlib.new(algorithm)
+    buffer = memoryview(bytearray(constants.CHKSUM_BUFFER_SIZE))
+    with tempfile.TemporaryFile() as stderr_file, open(
+        iso_file, "rb", buffering=0
+    ) as file:
+        process = subprocess.Popen(args, stdin=subprocess.PIPE, stderr=stderr_file)
+        with process:
+            bsdtar_reading = True
+            while size := file.readinto(buffer):
+                file_hash.update(buffer[:size])
+                if bsdtar_reading:
+                    try:
+                        process.stdin.write(buffer[:size])
+                    except BrokenPipeError:
+                        # bsdtar stopped reading, keep reading the ISO for the checksum.
+                        bsdtar_reading = False
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                # The data left in the buffer is not needed once bsdtar stopped reading.
+                pass
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            logger.error(stderr_file.read().decode(errors="replace"))
+            logger.error("Extracting ISO command did not run successfully. Exiting...")
+            sys.exit()
+    logger.info("Extracting ISO cmd ran successfully.")
+    return file_hash.hexdigest()
+
+
+def update_iso(base_iso_file, iso_file_name, iso_folder, iso_paths):
+    """
+    Creates an ISO image from a base ISO image, replacing only the given files.
+
+    xorriso copies the unchanged files and the boot images directly from the base ISO,
+    so the base ISO does not need to be extracted.
+
+    Args:
+        base_iso_file (str): The path to the base ISO file.
+        iso_file_name (str): The path of the ISO file to create.
+        iso_folder (str): The folder containing the updated files.
+        iso_paths (iterable): The paths of the updated files relative to the ISO folder.
+
+    Returns:
+        str: The MD5 checksum of the created ISO file.
+    """
+    # The ISO is written to the standard output and saved while calculating its checksum.
+    cmd = ["xorriso", "-indev", base_iso_file, "-outdev", "-"]
+    cmd += ["-boot_image", "any", "replay", "-joliet", "on"]
+    for iso_path in iso_paths:
+        cmd += ["-map", os.path.join(iso_folder, iso_path), f"/{iso_path}"]
+    return run_subprocess_cmd_to_file(
+        cmd, iso_file_name, "Create an ISO with the updated KS file"
+    )
+
+
+def get_iso_file_path(iso_folder, relative_path):
+    """
+    Resolves the path of a file in an extracted ISO, ignoring case.
+
+    ISO 9660 names are in upper case when extracted with bsdtar and in lower case when copied from a mount.
+
+    Args:
+        iso_folder (str): The folder containing the extracted ISO.
+        relative_path (str): The path of the file relative to the root of the ISO.
+
+    Returns:
+        str: The path of the file as present in the folder.
+    """
+    file_path = iso_folder
+    for name in relative_path.split("/"):
+        entries = {entry.lower(): entry for entry in os.listdir(file_path)}
+        file_path = os.path.join(file_path, entries.get(name.lower(), name))
+    return file_path
+
+
+def lowercase_iso_names(iso_folder):
+    """
+    Renames the files and folders of an extracted ISO to lower case.
+
+    bsdtar and 7z keep the upper case ISO 9660 names of the ESXi ISO, while a mounted ISO shows
+    them in lower case, which is how boot.cfg refers to them. Rebuilding the ISO from lower case
+    names keeps its Rock Ridge and Joliet names the same as when the ISO was copied from a mount.
+
+    Args:
+        iso_folder (str): The folder containing the extracted ISO.
+    """
+    for root, folder_names, file_names in os.walk(iso_folder, topdown=False):
+        # Folders extracted from an ISO are read-only.
+        os.chmod(root, os.stat(root).st_mode | stat.S_IWUSR)
+        for name in folder_names + file_names:
+            lower_name = name.lower()
+            if name != lower_name:
+                os.rename(os.path.join(root, name), os.path.join(root, lower_name))
 
 
 def validate_ip(ip):
@@ -129,18 +385,15 @@ def validate_ip(ip):
     Returns:
         bool: True if the IP address is valid, False otherwise.
     """
-    # Regular expression pattern for IPv4 with each octet ranging from 0 to 255.
-    ipv4_pattern = r"^((25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
-
-    # Check for IPv4 pattern match.
-    if re.match(ipv4_pattern, ip):
-        try:
-            # If valid, parse.
-            ipaddress.IPv4Address(ip)
-            return True
-        except ipaddress.AddressValueError:
-            return False
-    else:
+    # IPv4Address also accepts integers, so only dotted-quad strings are parsed.
+    # A dotted-quad has between 7 ("0.0.0.0") and 15 ("255.255.255.255") characters.
+    if not isinstance(ip, str) or not 7 <= len(ip) <= 15:
+        return False
+    try:
+        # Rejects anything other than four decimal octets ranging from 0 to 255.
+        ipaddress.IPv4Address(ip)
+        return True
+    except ipaddress.AddressValueError:
         return False
 
 
@@ -154,11 +407,22 @@ def validate_mac(mac):
     Returns:
         bool: True if the MAC address is valid, False otherwise.
     """
-    # Regular expression pattern for MAC addresses.
-    mac_pattern = r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$"
-
+    # A MAC address has 17 characters, skip the pattern match for any other length.
+    if len(mac) != 17:
+        return False
     # Check for MAC address pattern match.
-    return bool(re.match(mac_pattern, mac))
+    return MAC_PATTERN.match(mac) is not None
+
+
+# Validators of the host fields in the JSON, by the type of management network.
+# Hosts using DHCP have no static network parameters to validate.
+STATIC_HOST_VALIDATORS = {
+    "macAddress": validate_mac,
+    "mgmtIpv4": validate_ip,
+    "mgmtGateway": validate_ip,
+    "mgmtNetmask": validate_ip,
+}
+DHCP_HOST_VALIDATORS = {"macAddress": validate_mac}
 
 
 def validate_json(json_data):
@@ -166,41 +430,37 @@ def validate_json(json_data):
     Checks the validity of the network parameters in the provided JSON file.
 
     Args:
-        json_file (str): The path to the JSON file containing network parameters.
+        json_data (dict): The JSON data containing network parameters.
 
     Returns:
         bool: True if all network parameters are valid, False otherwise.
     """
-    error_string = False
-    validate_set_dns = json_data.get("dns", None)
-    validate_set_hosts = ["macAddress", "mgmtIpv4", "mgmtGateway", "mgmtNetmask"]
-    if validate_set_dns:
-        for validate_item in validate_set_dns:
-            if not validate_ip(validate_item):
-                error_string = True
-                logger.error(
-                    f"Invalid data is provided in JSON for the nameserver: '{validate_item}.'"
-                )
+    errors = []
+    # Bind the validators locally since they are looked up for every host.
+    is_valid_ip = validate_ip
+    static_host_validators = STATIC_HOST_VALIDATORS
+    dhcp_host_validators = DHCP_HOST_VALIDATORS
+    for validate_item in json_data.get("dns") or ():
+        if not is_valid_ip(validate_item):
+            errors.append(
+                f"Invalid data is provided in JSON for the nameserver: '{validate_item}.'"
+            )
 
     for host_data in json_data["hosts"]:
-        for validate_item in validate_set_hosts:
-            if validate_item == "macAddress":
-                if not validate_mac(host_data[validate_item]):
-                    error_string = True
-                    logger.error(
-                        f"Invalid data is provided in JSON for '{validate_item}' for the host {host_data['hostName']}."
-                    )
-            else:
-                if host_data[validate_item].lower() != "dhcp":
-                    if not validate_ip(host_data[validate_item]):
-                        error_string = True
-                        logger.error(
-                            f"Invalid data is provided in JSON for '{validate_item}' for the host {host_data['hostName']}."
-                        )
-                else:
-                    break
-
-    if error_string:
+        if host_data["mgmtIpv4"].casefold() == "dhcp":
+            host_validators = dhcp_host_validators
+        else:
+            host_validators = static_host_validators
+        for validate_item, is_valid in host_validators.items():
+            if not is_valid(host_data[validate_item]):
+                host_name = host_data.get("hostName", host_data["macAddress"])
+                errors.append(
+                    f"Invalid data is provided in JSON for '{validate_item}' for the host {host_name}."
+                )
+
+    if errors:
+        for error in errors:
+            logger.error(error)
         logger.error("Validation of JSON for valid IP address and MAC address failed.")
         return False
     logger.info(
@@ -209,6 +469,25 @@ def validate_json(json_data):
     return True
 
 
+def normalize_hosts(hosts):
+    """
+    Strips the surrounding whitespace from the string values of each host, once for all later uses.
+
+    Args:
+        hosts (list): The host entries from the JSON data.
+
+    Returns:
+        list: The host entries with the string values stripped.
+    """
+    return [
+        {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in host.items()
+        }
+        for host in hosts
+    ]
+
+
 def get_file_size(file_path):
     """
     Retrieves the size of a file in both bytes and a human-readable format.
@@ -258,17 +537,18 @@ def enough_disk_space(path, required_space):
     Returns:
         bool: True if there is enough disk space available, False otherwise.
     """
-    disk_usage = psutil.disk_usage(path)
-    available_space = disk_usage.free
+    available_space = shutil.disk_usage(path).free
     return available_space >= required_space
 
 
-def validate_disk_space(iso):
+def validate_disk_space(iso, builds=1):
     """
     Checks whether there is enough disk space to perform a copy operation for the given ISO file.
 
     Args:
         iso (str): The path to the ISO file.
+        builds (int, optional): The number of images built at the same time from ISO files of
+            up to this size. Defaults to 1.
 
     Returns:
         bool: True if there is enough disk space, False otherwise.
@@ -277,7 +557,7 @@ def validate_disk_space(iso):
     size_bytes, size_readable = get_file_size(file_path)
     logger.debug(f"The size of '{file_path}' is {size_readable}.")
     path_to_check = "./"  # Path to the drive you want to check
-    required_space_bytes = 2 * size_bytes  # double the size of the iso file
+    required_space_bytes = 2 * size_bytes * builds  # double the size of the iso file
     if enough_disk_space(path_to_check, required_space_bytes):
         logger.debug(
             f"The required disk space is: {convert_size(required_space_bytes)}"
@@ -290,26 +570,194 @@ def validate_disk_space(iso):
     return False
 
 
-def validate_iso_chksum(iso_file_name, chksum):
+def calculate_file_checksum(file_path, algorithm="md5"):
+    """
+    Calculates the checksum of a file by streaming it in fixed-size chunks.
+
+    Args:
+        file_path (str): The path to the file.
+        algorithm (str, optional): The hashlib algorithm name. Defaults to "md5".
+
+    Returns:
+        str: The hexadecimal checksum of the file.
+    """
+    # Python 3.11 and later hash the file in C without holding the GIL.
+    file_digest = getattr(hashlib, "file_digest", None)
+    with open(file_path, "rb", buffering=0) as file:
+        if file_digest:
+            return file_digest(file, algorithm).hexdigest()
+        # Read into a single reusable buffer instead of allocating every chunk.
+        file_hash = hashlib.new(algorithm)
+        buffer = memoryview(bytearray(constants.CHKSUM_BUFFER_SIZE))
+        while size := file.readinto(buffer):
+            file_hash.update(buffer[:size])
+        return file_hash.hexdigest()
+
+
+def get_iso_chksum(json_data):
+    """
+    Gets the expected checksum of the base ISO image and its algorithm from the JSON data.
+
+    The checksum is taken from 'isoChecksum' if specified, then 'isoSha256', then 'isoMdSum'.
+    Faster algorithms such as BLAKE2b or SHA-256 reduce the time to verify large ISO images.
+
+    Args:
+        json_data (dict): The JSON data containing configuration details for the ESXi installation.
+
+    Returns:
+        tuple: A tuple containing:
+            - algorithm (str): The hashlib algorithm of the checksum.
+            - chksum (str): The expected checksum.
+    """
+    iso_chksum = json_data.get("isoChecksum")
+    if iso_chksum:
+        if not (
+            isinstance(iso_chksum, dict)
+            and isinstance(iso_chksum.get("algorithm"), str)
+            and isinstance(iso_chksum.get("value"), str)
+        ):
+            logger.error(
+                "'isoChecksum' must contain the 'algorithm' and 'value' strings. Exiting..."
+            )
+            sys.exit()
+        algorithm = iso_chksum["algorithm"].strip().lower()
+        if algorithm not in CHKSUM_ALGORITHMS:
+            logger.error(
+                f"The checksum algorithm '{algorithm}' is not supported. Supported algorithms: {', '.join(sorted(CHKSUM_ALGORITHMS))}. Exiting..."
+            )
+            sys.exit()
+        return algorithm, iso_chksum["value"].strip()
+    # Prefer the SHA-256 checksum, which OpenSSL accelerates with the SHA extensions.
+    if json_data.get("isoSha256"):
+        return "sha256", (json_data["isoSha256"]).strip()
+    return "md5", (json_data["isoMdSum"]).strip()
+
+
+def read_chksum_cache(iso_file_name, algorithm):
+    """
+    Reads the checksum of an ISO image from its cache file, if the ISO has not changed since.
+
+    The cache file is stored next to the ISO file and records the size and modification time
+    of the ISO, so that re-running the script does not read the whole ISO again.
+
+    Args:
+        iso_file_name (str): The path to the ISO file.
+        algorithm (str): The hashlib algorithm of the checksum.
+
+    Returns:
+        str: The cached checksum, or None if it is not cached or the ISO has changed.
+    """
+    try:
+        with open(f"{iso_file_name}{constants.CHKSUM_CACHE_SUFFIX}") as cache_file:
+            cache = json.load(cache_file)
+        iso_stat = os.stat(iso_file_name)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cache, dict)
+        or cache.get("size") != iso_stat.st_size
+        or cache.get("mtime_ns") != iso_stat.st_mtime_ns
+    ):
+        return None
+    checksums = cache.get("checksums")
+    if not isinstance(checksums, dict):
+        return None
+    chksum = checksums.get(algorithm)
+    return chksum if isinstance(chksum, str) else None
+
+
+def write_chksum_cache(iso_file_name, algorithm, chksum):
+    """
+    Writes the checksum of an ISO image to its cache file, keeping the checksums of other algorithms.
+
+    Args:
+        iso_file_name (str): The path to the ISO file.
+        algorithm (str): The hashlib algorithm of the checksum.
+        chksum (str): The checksum of the ISO file.
+    """
+    cache_file_name = f"{iso_file_name}{constants.CHKSUM_CACHE_SUFFIX}"
+    try:
+        iso_stat = os.stat(iso_file_name)
+        checksums = {}
+        try:
+            with open(cache_file_name) as cache_file:
+                cache = json.load(cache_file)
+            if (
+                isinstance(cache, dict)
+                and cache.get("size") == iso_stat.st_size
+                and cache.get("mtime_ns") == iso_stat.st_mtime_ns
+                and isinstance(cache.get("checksums"), dict)
+            ):
+                checksums = cache["checksums"]
+        except (OSError, ValueError):
+            pass
+        checksums[algorithm] = chksum
+        cache = {
+            "size": iso_stat.st_size,
+            "mtime_ns": iso_stat.st_mtime_ns,
+            "checksums": checksums,
+        }
+        # Write to a temporary file and rename it, so the cache file is never partially written.
+        temp_file = tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(os.path.abspath(iso_file_name)), delete=False
+        )
+        try:
+            with temp_file:
+                json.dump(cache, temp_file)
+            os.replace(temp_file.name, cache_file_name)
+        finally:
+            # Only left behind if writing or renaming the temporary file failed.
+            if os.path.exists(temp_file.name):
+                os.unlink(temp_file.name)
+    except OSError as e:
+        logger.debug(
+            f"The checksum cache file '{cache_file_name}' was not written: {e}"
+        )
+
+
+def validate_iso_chksum(
+    iso_file_name, chksum, algorithm="md5", calculated_chksum=None, use_cache=False
+):
     """
     Verifies the checksum for the provided ISO image.
 
     Args:
         iso_file_name (str): The path to the ISO file.
         chksum (str): The expected checksum to compare against.
+        algorithm (str, optional): The hashlib algorithm of the checksum. Defaults to "md5".
+        calculated_chksum (str, optional): The checksum if already calculated, for example while
+            extracting the ISO. Defaults to None, which calculates the checksum of the file.
+        use_cache (bool, optional): Whether to read and write the checksum cache file of the ISO.
+            Defaults to False.
 
     Returns:
         bool: True if the calculated checksum matches the provided checksum, False otherwise.
     """
-    calculated_chksum = hashlib.md5(open(iso_file_name, "rb").read()).hexdigest()
-    if calculated_chksum == chksum:
+    if calculated_chksum is None and use_cache:
+        calculated_chksum = read_chksum_cache(iso_file_name, algorithm)
+        if calculated_chksum is not None:
+            logger.info(
+                f"Using the cached {algorithm} checksum of '{iso_file_name}', the ISO file is not verified again."
+            )
+            use_cache = False
+    if calculated_chksum is None:
+        calculated_chksum = calculate_file_checksum(iso_file_name, algorithm)
+    if use_cache:
+        write_chksum_cache(iso_file_name, algorithm, calculated_chksum)
+    if calculated_chksum == chksum.lower():
         logger.info("The checksum has been matched, proceeding.")
         return True
     logger.error(f"Given checksum '{chksum}' did not match. Exiting...")
     return False
 
 
-def build_custom_image(json_data, encrypted_root_pwd, iso_suffix=None):
+def build_custom_image(
+    json_data,
+    encrypted_root_pwd,
+    iso_suffix=None,
+    use_chksum_cache=False,
+    use_xorriso=False,
+):
     """
     Creates an installation script and generates an ISO image by embedding the installation script into the given ISO image.
 
@@ -317,17 +765,21 @@ def build_custom_image(json_data, encrypted_root_pwd, iso_suffix=None):
         json_data (dict): The JSON data containing configuration details for the ESXi installation.
         encrypted_root_pwd (str): The encrypted root password for the ESXi installation.
         iso_suffix (str, optional): The suffix to append to the generated ISO file name. Defaults to None.
+        use_chksum_cache (bool, optional): Whether to trust the cached checksum of an unchanged base ISO. Defaults to False.
+        use_xorriso (bool, optional): Whether to create the ISO with xorriso from the base ISO instead of with mkisofs. Defaults to False.
 
     Returns:
         None
     """
     esxi_iso_file = (json_data["esxiIsoFileName"]).strip()
-    isochecksum = (json_data["isoMdSum"]).strip()
+    chksum_algorithm, isochecksum = get_iso_chksum(json_data)
     dns_suffix_0 = json_data.get("dnsSuffix0")
     dns = json_data.get("dns", None)
-    mnt_folder = constants.ESXI_CDROM_MOUNT_DIR
     esxi_root_pwd = encrypted_root_pwd
     esxi_eula = (json_data["AcceptEsxiLicenseAgreement"]).strip()
+    # Normalize the hosts once for the validation and the installation script.
+    hosts = normalize_hosts(json_data["hosts"])
+    json_data = dict(json_data, hosts=hosts)
 
     # Validate the ESXi EULA value.
     if not esxi_eula == "Yes":
@@ -348,162 +800,327 @@ def build_custom_image(json_data, encrypted_root_pwd, iso_suffix=None):
     # Validate the disk space.
     if not validate_disk_space(esxi_iso_file):
         sys.exit()
-    # Validate the checksum.
-    if not validate_iso_chksum(esxi_iso_file, isochecksum):
+    # Validate the checksum, unless bsdtar calculates it while extracting the ISO
+    # because it is not cached.
+    use_bsdtar = shutil.which("bsdtar") is not None
+    hash_while_extracting = use_bsdtar and not (
+        use_chksum_cache
+        and read_chksum_cache(esxi_iso_file, chksum_algorithm) is not None
+    )
+    if not hash_while_extracting and not validate_iso_chksum(
+        esxi_iso_file, isochecksum, chksum_algorithm, use_cache=use_chksum_cache
+    ):
         sys.exit()
 
-    # Create random string and create folders.
-    RANDOM_STRING = "".join(random.choices(string.ascii_uppercase + string.digits, k=5))
-    temp_folder = os.path.join("./temp/", RANDOM_STRING)
-    if not os.path.exists(constants.LOG_PATH):
-        os.makedirs(constants.LOG_PATH)
-    if os.path.exists(mnt_folder):
-        os.rmdir(mnt_folder)
-    os.makedirs(mnt_folder)
-    os.makedirs(temp_folder)
-
-    # Mount the ISO file, copy the contents into the temp folder, and umount.
-    run_subprocess_cmd(f"mount -o loop {esxi_iso_file} {mnt_folder}", "Mounting ISO")
-    run_subprocess_cmd(f"cp -r {mnt_folder}/* {temp_folder}", "Copying the ISO")
-    run_subprocess_cmd(f"umount {mnt_folder}", "Unmounting ISO")
-    os.rmdir(mnt_folder)
-
-    # Update boot.cfg.
-    boot_config_file_path = os.path.join(temp_folder, "boot.cfg")
-    boot_config_file_path2 = os.path.join(temp_folder, "efi/boot/boot.cfg")
-    case_insensitive_search_and_replace(
-        boot_config_file_path,
-        "kernelopt=runweasel",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    case_insensitive_search_and_replace(
-        boot_config_file_path2,
-        "kernelopt=runweasel",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    case_insensitive_search_and_replace(
-        boot_config_file_path,
-        "kernelopt=cdromBoot runweasel",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    case_insensitive_search_and_replace(
-        boot_config_file_path2,
-        "kernelopt=cdromBoot runweasel",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    case_insensitive_search_and_replace(
-        boot_config_file_path,
-        "kernelopt=runweasel cdromBoot",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    case_insensitive_search_and_replace(
-        boot_config_file_path2,
-        "kernelopt=runweasel cdromBoot",
-        "kernelopt=runweasel ks=cdrom:/KS.CFG",
-    )
-    # Create KS.CFG.
-    temp_path = os.path.join(temp_folder, "KS.CFG")
-    ks_file = open(temp_path, "w+")
-    # Add primary info into the KS.CFG.
-    ks_file.write(f"{esxi_eula_value} \n")
-    ks_file.write(f"rootpw --iscrypted {esxi_root_pwd}")
-    ks_file.write("%include /tmp/pre_script.cfg\n")
-    ks_file.write("reboot \n")
-    # Add firstboot.
-    ks_file.write("\n%firstboot --interpreter=busybox\n")
-    # Add post installation commands.
-    file_path = "firstboot-scripts.txt"
-    with open(file_path, "r") as file:
-        file_contents = file.read()
-    for line in file_contents:
-        ks_file.write(line)
-    # Add network and install media info under pre-script for each host.
-    ks_file.write("\n\n%pre --interpreter=busybox \n")
-    for host in json_data["hosts"]:
-        server_mac_adress = (host["macAddress"]).lower()
-        clear_part = host.get("clearPart")
-        install_disk = (host["installDisk"]).strip()
-        mgmt_ipv4 = host["mgmtIpv4"]
-        vlan = (host["mgmtVlanId"]).strip()
-        ks_file.write(f'if esxcfg-nics -l | grep -q "{server_mac_adress}"\n')
-        ks_file.write("then\n")
-        if clear_part:
-            logger.debug(
-                f'The value provided for the clearPart is "{clear_part.strip()}" for the host with the MAC address {server_mac_adress}'
-            )
-            ks_file.write(
-                f"echo clearpart {clear_part.strip()} >> /tmp/pre_script.cfg\n"
-            )
-        if mgmt_ipv4.lower() == "dhcp":
-            network_cmd = (
-                f"network --bootproto=dhcp --vlanid={vlan} --device={server_mac_adress}"
+    # Only extract the boot.cfg files if xorriso can update the ISO in place.
+    if use_xorriso and not (use_bsdtar and shutil.which("xorriso")):
+        logger.warning(
+            "xorriso and bsdtar are required to update the ISO in place, using mkisofs instead."
+        )
+        use_xorriso = False
+    # Only a few small files are written for xorriso, so use the system temp directory,
+    # which is often a tmpfs. Otherwise extract the whole ISO into the current directory,
+    # whose disk space has been checked. The directory is deleted on exit, even on failure.
+    with tempfile.TemporaryDirectory(
+        prefix="esxi-imaging-", dir=None if use_xorriso else "."
+    ) as temp_folder:
+        if use_bsdtar:
+            calculated_chksum = extract_iso_with_chksum(
+                esxi_iso_file,
+                temp_folder,
+                chksum_algorithm if hash_while_extracting else None,
+                BOOT_CONFIG_FILES if use_xorriso else None,
             )
+            if hash_while_extracting and not validate_iso_chksum(
+                esxi_iso_file,
+                isochecksum,
+                chksum_algorithm,
+                calculated_chksum,
+                use_chksum_cache,
+            ):
+                sys.exit()
         else:
-            host_name = (host["hostName"]).strip()
-            mgmt_net_mask = host["mgmtNetmask"]
-            mgmt_gw = host["mgmtGateway"]
-            mgmt_hostname = ".".join(
-                [host_name, dns_suffix_0] if dns_suffix_0 else [host_name]
-            )
-            if dns:
-                dns_string = ",".join(dns)
-                network_cmd = f"network --bootproto=static --ip={mgmt_ipv4} --netmask={mgmt_net_mask} --gateway={mgmt_gw} --vlanid={vlan} --hostname={mgmt_hostname} --device={server_mac_adress} --nameserver={dns_string.strip()}"
-            else:
-                network_cmd = f"network --bootproto=static --ip={mgmt_ipv4} --netmask={mgmt_net_mask} --gateway={mgmt_gw} --vlanid={vlan} --hostname={mgmt_hostname} --device={server_mac_adress}"
-        ks_file.write(f"echo {network_cmd} >> /tmp/pre_script.cfg \n")
-        logger.debug(
-            f'The value provided for the network is "{network_cmd}" for the host with the MAC address {server_mac_adress}'
-        )
-
+            extract_iso(esxi_iso_file, temp_folder)
+        if not use_xorriso:
+            lowercase_iso_names(temp_folder)
+
+        # Update boot.cfg.
+        boot_config_file_paths = [
+            get_iso_file_path(temp_folder, boot_config_file)
+            for boot_config_file in BOOT_CONFIG_FILES
+        ]
+        for boot_config_file_path in boot_config_file_paths:
+            update_boot_config(boot_config_file_path)
+        # Create KS.CFG in memory and write it to the file once.
+        temp_path = os.path.join(temp_folder, "KS.CFG")
+        ks_buffer = io.StringIO()
+        ks_write = ks_buffer.write
+        # Add primary info into the KS.CFG.
+        ks_write(f"{esxi_eula_value} \n")
+        ks_write(f"rootpw --iscrypted {esxi_root_pwd}\n")
+        ks_write("%include /tmp/pre_script.cfg\n")
+        ks_write("reboot \n")
+        # Add firstboot.
+        ks_write("\n%firstboot --interpreter=busybox\n")
+        # Add post installation commands.
+        file_path = "firstboot-scripts.txt"
+        with open(file_path, "r") as file:
+            shutil.copyfileobj(file, ks_buffer, constants.COPY_BUFFER_SIZE)
+        # Add network and install media info under pre-script for each host.
+        ks_write("\n\n%pre --interpreter=busybox \n")
+        # Collect the lines of all hosts and add them to the buffer in a single call.
+        pre_script_parts = []
+        pre_script_append = pre_script_parts.append
+        # Values shared by all hosts.
+        host_name_suffix = f".{dns_suffix_0}" if dns_suffix_0 else ""
+        nameserver_option = f" --nameserver={','.join(dns).strip()}" if dns else ""
         allowed_install_disks = {"usb", "local"}
-        if install_disk not in allowed_install_disks and not install_disk.startswith(
-            "--"
-        ):
-            raise ValueError(f"Invalid install_disk value: {install_disk}")
-
         disk_commands = {
             "usb": "--firstdisk=usb --overwritevmfs",
             "local": "--firstdisk=local --overwritevmfs",
         }
-        if install_disk in disk_commands:
-            ks_file.write(
-                f"echo install {disk_commands[install_disk]} >> /tmp/pre_script.cfg\n"
-            )
+        for host in hosts:
+            server_mac_adress = host["macAddress"].lower()
+            clear_part = host.get("clearPart")
+            install_disk = host["installDisk"]
+            mgmt_ipv4 = host["mgmtIpv4"]
+            vlan = host["mgmtVlanId"]
+            pre_script_append(f'if esxcfg-nics -l | grep -q "{server_mac_adress}"\n')
+            pre_script_append("then\n")
+            if clear_part:
+                logger.debug(
+                    f'The value provided for the clearPart is "{clear_part}" for the host with the MAC address {server_mac_adress}'
+                )
+                pre_script_append(
+                    f"echo clearpart {clear_part} >> /tmp/pre_script.cfg\n"
+                )
+            if mgmt_ipv4.lower() == "dhcp":
+                network_cmd = f"network --bootproto=dhcp --vlanid={vlan} --device={server_mac_adress}"
+            else:
+                host_name = host["hostName"]
+                mgmt_net_mask = host["mgmtNetmask"]
+                mgmt_gw = host["mgmtGateway"]
+                mgmt_hostname = f"{host_name}{host_name_suffix}"
+                network_cmd = f"network --bootproto=static --ip={mgmt_ipv4} --netmask={mgmt_net_mask} --gateway={mgmt_gw} --vlanid={vlan} --hostname={mgmt_hostname} --device={server_mac_adress}{nameserver_option}"
+            pre_script_append(f"echo {network_cmd} >> /tmp/pre_script.cfg \n")
             logger.debug(
-                f'The value provided for the install disk is "{install_disk}"({disk_commands[install_disk]}) for the host with the MAC address {server_mac_adress}'
+                f'The value provided for the network is "{network_cmd}" for the host with the MAC address {server_mac_adress}'
             )
+
+            if (
+                install_disk not in allowed_install_disks
+                and not install_disk.startswith("--")
+            ):
+                raise ValueError(f"Invalid install_disk value: {install_disk}")
+
+            if install_disk in disk_commands:
+                pre_script_append(
+                    f"echo install {disk_commands[install_disk]} >> /tmp/pre_script.cfg\n"
+                )
+                logger.debug(
+                    f'The value provided for the install disk is "{install_disk}"({disk_commands[install_disk]}) for the host with the MAC address {server_mac_adress}'
+                )
+            else:
+                pre_script_append(
+                    f"echo install {install_disk} >> /tmp/pre_script.cfg\n"
+                )
+                logger.debug(
+                    f'The value provided for the install disk is "{install_disk}" for the host with the MAC address {server_mac_adress}'
+                )
+            pre_script_append("fi\n")
+        ks_buffer.writelines(pre_script_parts)
+        with open(temp_path, "w") as ks_file:
+            ks_file.write(ks_buffer.getvalue())
+        # Create ISO with updated KS file.
+        if iso_suffix:
+            iso_file_name = f'{esxi_iso_file.split(".iso")[0]}-{iso_suffix}.iso'
         else:
-            ks_file.write(f"echo install {install_disk} >> /tmp/pre_script.cfg\n")
-            logger.debug(
-                f'The value provided for the install disk is "{install_disk}" for the host with the MAC address {server_mac_adress}'
+            iso_file_name = (
+                f'{esxi_iso_file.split(".iso")[0]}-{time.strftime("%Y%m%d-%H%M")}.iso'
+            )
+        if use_xorriso:
+            updated_iso_paths = [
+                os.path.relpath(boot_config_file_path, temp_folder)
+                for boot_config_file_path in boot_config_file_paths
+            ]
+            updated_iso_paths.append("KS.CFG")
+            md5_chksum = update_iso(
+                esxi_iso_file, iso_file_name, temp_folder, updated_iso_paths
+            )
+        else:
+            bios_boot_image = os.path.relpath(
+                get_iso_file_path(temp_folder, "isolinux.bin"), temp_folder
+            )
+            efi_boot_image = os.path.relpath(
+                get_iso_file_path(temp_folder, "efiboot.img"), temp_folder
+            )
+            # Without -o, mkisofs writes the ISO to the standard output.
+            cmd = ["mkisofs", "-relaxed-filenames", "-quiet", "-J", "-R"]
+            cmd += ["-b", bios_boot_image, "-c", "boot.cat", "-no-emul-boot"]
+            cmd += ["-boot-load-size", "4", "-boot-info-table", "-eltorito-alt-boot"]
+            cmd += ["-e", efi_boot_image, "-no-emul-boot", temp_folder]
+            md5_chksum = run_subprocess_cmd_to_file(
+                cmd, iso_file_name, "Create an ISO with the updated KS file"
             )
-        ks_file.write("fi\n")
-    ks_file.close()
-    # Create ISO with updated KS file and remove the temporary directory.
-    if iso_suffix:
-        iso_file_name = f'{esxi_iso_file.split(".iso")[0]}-{iso_suffix}.iso'
-    else:
-        iso_file_name = (
-            f'{esxi_iso_file.split(".iso")[0]}-{time.strftime("%Y%m%d-%H%M")}.iso'
-        )
-    cmd = f"mkisofs -relaxed-filenames  -quiet  -J -R -o {iso_file_name} -b isolinux.bin -c boot.cat -no-emul-boot -boot-load-size 4 -boot-info-table -eltorito-alt-boot -e efiboot.img -no-emul-boot {temp_folder}"
-    run_subprocess_cmd(cmd, "Create an ISO with the updated KS file")
-    md5_chksum = hashlib.md5(open(iso_file_name, "rb").read()).hexdigest()
-    # Delete the temporary directory and all of its contents.
-    shutil.rmtree(temp_folder)
-    shutil.rmtree("./temp")
-    logger.debug(f"Temp directory '{temp_folder}' and './temp' have been deleted.")
     logger.info(
         f"The ESXi image '{iso_file_name}' has been created with the installation script.Its MD5 checksum is :{md5_chksum}"
     )
 
 
+def load_json(json_file_path):
+    """
+    Loads a JSON file, using orjson when it is installed.
+
+    Args:
+        json_file_path (str): The path to the JSON file.
+
+    Returns:
+        dict: The JSON data.
+    """
+    if orjson:
+        with open(json_file_path, "rb") as file_handle:
+            return orjson.loads(file_handle.read())
+    with open(json_file_path) as file_handle:
+        return json.load(file_handle)
+
+
+def build_many(
+    json_file_paths,
+    encrypted_root_pwd,
+    iso_suffix=None,
+    jobs=1,
+    use_chksum_cache=False,
+    use_xorriso=False,
+):
+    """
+    Creates an ISO image for each of the given JSON files, building up to the given number of images in parallel.
+
+    Args:
+        json_file_paths (list): The paths to the JSON files containing configuration details for the ESXi installation.
+        encrypted_root_pwd (str): The encrypted root password for the ESXi installation.
+        iso_suffix (str, optional): The suffix to append to the generated ISO file names. Defaults to None.
+        jobs (int, optional): The maximum number of ISO images to build in parallel. Defaults to 1.
+        use_chksum_cache (bool, optional): Whether to trust the cached checksum of an unchanged base ISO. Defaults to False.
+        use_xorriso (bool, optional): Whether to create the ISO images with xorriso from the base ISO instead of with mkisofs. Defaults to False.
+
+    Returns:
+        None
+    """
+    if len(json_file_paths) > 1 and not iso_suffix:
+        # Keep the default timestamp suffix, shared by the ISO files of all the JSON files.
+        iso_suffix = time.strftime("%Y%m%d-%H%M")
+    json_file_names = [
+        os.path.splitext(os.path.basename(json_file_path))[0]
+        for json_file_path in json_file_paths
+    ]
+    json_file_name_counts = Counter(json_file_names)
+    builds = []
+    for index, (json_file_path, json_file_name) in enumerate(
+        zip(json_file_paths, json_file_names), start=1
+    ):
+        json_data = load_json(json_file_path)
+        # Add the JSON file name to the suffix so that the ISO file names are unique,
+        # and its position when JSON files in different folders have the same name.
+        if len(json_file_paths) > 1:
+            if json_file_name_counts[json_file_name] > 1:
+                json_file_name = f"{json_file_name}-{index}"
+            json_iso_suffix = f"{iso_suffix}-{json_file_name}"
+        else:
+            json_iso_suffix = iso_suffix
+        builds.append((json_file_path, json_data, json_iso_suffix))
+
+    if len(builds) == 1:
+        build_custom_image(
+            builds[0][1],
+            encrypted_root_pwd,
+            builds[0][2],
+            use_chksum_cache,
+            use_xorriso,
+        )
+        return
+
+    failed_json_file_paths = []
+    if jobs <= 1:
+        # Keep building the other images when one of them fails.
+        for json_file_path, json_data, json_iso_suffix in builds:
+            try:
+                build_custom_image(
+                    json_data,
+                    encrypted_root_pwd,
+                    json_iso_suffix,
+                    use_chksum_cache,
+                    use_xorriso,
+                )
+            except SystemExit:
+                failed_json_file_paths.append(json_file_path)
+            except Exception:
+                logger.exception(f"Error while processing '{json_file_path}'.")
+                failed_json_file_paths.append(json_file_path)
+    else:
+        # Each build only checks the disk space for itself, so check it for the parallel builds.
+        esxi_iso_files = {
+            json_data["esxiIsoFileName"].strip() for _, json_data, _ in builds
+        }
+        existing_esxi_iso_files = [
+            esxi_iso_file
+            for esxi_iso_file in esxi_iso_files
+            if os.path.exists(esxi_iso_file)
+        ]
+        if existing_esxi_iso_files and not validate_disk_space(
+            max(existing_esxi_iso_files, key=os.path.getsize), min(jobs, len(builds))
+        ):
+            sys.exit()
+
+        # Start the worker processes with spawn, since forking this process would also copy
+        # the state of its logging threads.
+        mp_context = multiprocessing.get_context("spawn")
+        # Log records of the worker processes are written by the handlers of this process.
+        log_queue, log_listener = create_process_log_queue(mp_context)
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=mp_context,
+            initializer=set_log_queue,
+            initargs=(log_queue,),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    build_custom_image,
+                    json_data,
+                    encrypted_root_pwd,
+                    json_iso_suffix,
+                    use_chksum_cache,
+                    use_xorriso,
+                ): json_file_path
+                for json_file_path, json_data, json_iso_suffix in builds
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except SystemExit:
+                    failed_json_file_paths.append(futures[future])
+                except Exception:
+                    logger.exception(f"Error while processing '{futures[future]}'.")
+                    failed_json_file_paths.append(futures[future])
+        log_listener.stop()
+
+    if failed_json_file_paths:
+        for json_file_path in failed_json_file_paths:
+            logger.error(
+                f"Failed to create the ESXi image for the JSON file '{json_file_path}'."
+            )
+        sys.exit()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Script for creating an ESXi ISO file with a kickstart file from the base ESXi ISO."
     )
     parser.add_argument(
-        "-j", "--json", help="Specify the input JSON file", required=True
+        "-j",
+        "--json",
+        nargs="+",
+        help="Specify one or more input JSON files, an ISO file is created for each",
+        required=True,
     )
     parser.add_argument(
         "-s",
@@ -511,11 +1128,35 @@ if __name__ == "__main__":
         help="Specify the suffix to be used in the output ISO file",
         required=False,
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Specify the number of ISO files to create in parallel",
+        required=False,
+    )
+    parser.add_argument(
+        "--checksum-cache",
+        action="store_true",
+        help="Cache the checksum of the base ISO next to it, and trust the cached checksum while the size and modification time of the ISO are unchanged",
+        required=False,
+    )
+    parser.add_argument(
+        "--xorriso",
+        action="store_true",
+        help="Create the ISO with xorriso by replacing only the updated files of the base ISO, instead of rebuilding it with mkisofs",
+        required=False,
+    )
     args = parser.parse_args()
 
     rootw_pwd = generate_encrypted_root_pwd()
-    with open(args.json) as file_handle:
-        json_file = json.load(file_handle)
 
     # Create custom ISO
-    build_custom_image(json_file, rootw_pwd, args.suffix)
+    build_many(
+        args.json,
+        rootw_pwd,
+        args.suffix,
+        args.jobs,
+        args.checksum_cache,
+        args.xorriso,
+    )
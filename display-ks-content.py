@@ -20,6 +20,7 @@ Example:
 # Standard library imports.
 import argparse
 import os
+import shutil
 import subprocess
 import sys
 
@@ -30,54 +31,103 @@ from LogUtility import logger
 
 def run_subprocess_cmd(cmd, description):
     """
-    Executes a system command and returns the output.
+    Executes a system command without a shell and returns the output.
 
     Args:
-        cmd (str): The system command to execute.
+        cmd (list): The system command to execute as a list of arguments.
         description (str): A description of the command being executed.
 
     Returns:
         str: The output from the command execution.
     """
     try:
-        output = subprocess.run([cmd], shell=True, capture_output=True, text=True)
-        if output.returncode != 0:
-            logger.error(output.stderr)
-            logger.error(f"{description} cmd did not run successfully, exiting...")
-            sys.exit()
-        else:
-            logger.info(f"{description} cmd ran successfully")
-            return output.stdout
-    except subprocess.CalledProcessError as e:
-        logger.error("Error occurred:", e)
+        output = subprocess.run(cmd, capture_output=True, text=True)
+    except FileNotFoundError:
+        logger.error(f"{cmd[0]}: command not found")
+        logger.error(f"{description} cmd did not run successfully, exiting...")
+        sys.exit()
+    if output.returncode != 0:
+        logger.error(output.stderr)
+        logger.error(f"{description} cmd did not run successfully, exiting...")
+        sys.exit()
+    logger.info(f"{description} cmd ran successfully")
+    return output.stdout
+
+
+def read_ks_file_with_bsdtar(iso_file):
+    """
+    Reads the kickstart file from the specified ESXi ISO using bsdtar, without mounting the ISO.
+
+    Args:
+        iso_file (str): The path to the ESXi ISO file.
+
+    Returns:
+        str: The kickstart file content, or None if the ISO does not contain a kickstart file.
+    """
+    # Write the first matching file to the standard output, ignoring the case of its name.
+    args = ["bsdtar", "-xqOf", iso_file, "[kK][sS].[cC][fF][gG]"]
+    # Use the C locale so that the error message for a missing file is not translated.
+    output = subprocess.run(
+        args, capture_output=True, text=True, env={**os.environ, "LC_ALL": "C"}
+    )
+    if output.returncode != 0:
+        if "Not found in archive" in output.stderr:
+            return None
+        logger.error(output.stderr)
+        logger.error("Reading KS.CFG cmd did not run successfully, exiting...")
+        sys.exit()
+    logger.info("Reading KS.CFG cmd ran successfully")
+    return output.stdout
+
+
+def read_ks_file_with_mount(iso_file):
+    """
+    Reads the kickstart file from the specified ESXi ISO by mounting the ISO.
+
+    Args:
+        iso_file (str): The path to the ESXi ISO file.
+
+    Returns:
+        str: The kickstart file content, or None if the ISO does not contain a kickstart file.
+    """
+    mnt_folder = constants.ESXI_CDROM_MOUNT_DIR
+    os.makedirs(mnt_folder, exist_ok=True)
+    # Mount the ISO file, read the content, and umount.
+    run_subprocess_cmd(["mount", "-o", "loop", iso_file, mnt_folder], "Mounting ISO")
+    KS_file = f"{mnt_folder}/KS.CFG"
+    try:
+        with open(KS_file, "r") as file_handle:
+            ks_content = file_handle.read()
+    except FileNotFoundError:
+        ks_content = None
+    run_subprocess_cmd(["umount", mnt_folder], "Unmounting ISO")
+    os.rmdir(mnt_folder)
+    return ks_content
 
 
 def display_ks_file(iso_file):
     """
     Displays the kickstart file content of the specified ESXi ISO.
 
+    The ISO is read with bsdtar when available, which does not require root privileges.
+    Otherwise the ISO is mounted.
+
     Args:
         iso_path (str): The path to the ESXi ISO file.
 
     Returns:
         None
     """
-    mnt_folder = constants.ESXI_CDROM_MOUNT_DIR
-    if os.path.exists(mnt_folder):
-        os.rmdir(mnt_folder)
-    os.makedirs(mnt_folder)
-    # Mount the ISO file, display the content, and umount.
-    run_subprocess_cmd(f"mount -o loop {iso_file} {mnt_folder}", "Mounting ISO")
-    KS_file = f"{mnt_folder}/KS.CFG"
-    if os.path.exists(KS_file):
-        with open(KS_file, "r") as file_handle:
-            logger.info(
-                f"===========================START OF KS FILE=======================================\n {file_handle.read()}\n===========================END OF KS FILE======================================="
-            )
+    if shutil.which("bsdtar"):
+        ks_content = read_ks_file_with_bsdtar(iso_file)
     else:
+        ks_content = read_ks_file_with_mount(iso_file)
+    if ks_content is None:
         logger.error("The KS.CFG file was not found in the provided ISO file.")
-    run_subprocess_cmd(f"umount {mnt_folder}", "Unmounting ISO")
-    os.rmdir(mnt_folder)
+        return
+    logger.info(
+        f"===========================START OF KS FILE=======================================\n {ks_content}\n===========================END OF KS FILE======================================="
+    )
 
 
 if __name__ == "__main__":